@@ -4,7 +4,10 @@ import asyncio
 import re
 import time
 import uuid
+from collections import defaultdict
 from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple
 
 import aiohttp
 
@@ -15,10 +18,23 @@ from astrbot.api.star import Context, Star, StarTools
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
 
 from .steam_api import SteamApi
+from .steam_cache import TtlLruCache, single_flight
 from .steam_render import SteamRenderer
 from .steam_store import SteamStateStore
 
 
+# 第一遍差分得到的、需要进入状态机的一条绑定及其本轮玩家数据。
+class _PlayerTransition(NamedTuple):
+    binding: dict
+    steamid64: str
+    steam_name: str
+    avatar: str
+    new_state: str
+    new_appid: int
+    new_game: str
+    changed: bool
+
+
 class SteamWatch(Star):
     _global_poll_task: asyncio.Task | None = None
     _online_offline_grid_id = 148182
@@ -26,6 +42,12 @@ class SteamWatch(Star):
         r"https?://store\.steampowered\.com/app/(\d+)(?:/[^\s]*)?",
         flags=re.IGNORECASE,
     )
+    _bind_payload_cq_re = re.compile(r"\[CQ:[^\]]+\]", flags=re.IGNORECASE)
+    _bind_payload_mention_re = re.compile(r"<@!?\d+>")
+    _whitespace_re = re.compile(r"\s+")
+    _bind_qq_arg_re = re.compile(r"(?:qq[:=])?(\d{5,12})", flags=re.IGNORECASE)
+    _llm_comment_strip_chars = " \"'“”‘’"
+    _llm_comment_tail_punct = "，。,.!?！？"
     _default_llm_comment_prompt = (
         "你是游戏群里的简短播报助手。"
         "玩家 {display_name} 刚结束《{game_name}》；{duration_text}。"
@@ -34,6 +56,21 @@ class SteamWatch(Star):
     _llm_comment_timeout_sec = 15
     _llm_comment_max_attempts = 2
     _llm_comment_concurrency = 1
+    _change_entry_concurrency = 8
+    # 单条变化等待 LLM 点评（含排队）的总预算，超时则不带点评照常推送
+    _llm_comment_budget_sec = 20
+    # 连续多次点评请求失败（含超时）后暂停调用一段时间，避免模型不可用时每条都等满超时
+    _llm_comment_breaker_threshold = 3
+    _llm_comment_breaker_cooldown_sec = 300
+    _poll_tick_min_timeout_sec = 120
+    _presence_states = frozenset({"online", "offline"})
+    _state_codes = MappingProxyType({"offline": 0, "online": 1, "in_game": 2})
+    # 变化类型表：[旧状态][新状态]，用于选择变化卡片的展示分支。
+    _transition_kinds = (
+        ("presence", "presence", "start"),
+        ("presence", "presence", "start"),
+        ("end", "end", "start"),
+    )
 
     def __init__(self, context: Context, config=None):
         super().__init__(context, config)
@@ -105,11 +142,27 @@ class SteamWatch(Star):
 
         self._lock = asyncio.Lock()
         self._llm_comment_lock = asyncio.Semaphore(self._llm_comment_concurrency)
+        self._llm_comment_failures = 0
+        self._llm_comment_disabled_until = 0.0
+        self._change_entry_sem = asyncio.Semaphore(self._change_entry_concurrency)
+        # 封面解码时已缩到 920x920 以内，单张 RGB 仍约 1.7MB，容量需保守。
+        self._cover_cache = TtlLruCache(maxsize=32, ttl_sec=86400)
+        self._avatar_cache = TtlLruCache(maxsize=128, ttl_sec=3600)
+        self._nickname_cache = TtlLruCache(maxsize=128, ttl_sec=300)
+        # 模型可能被用户切换或在 AstrBot 中重载/删除，短 TTL 缓存即可。
+        # 键为会话 umo 或 ("id", 提供商 id)。
+        self._provider_cache = TtlLruCache(maxsize=64, ttl_sec=60)
+        self._nickname_inflight: dict[tuple[str, str, str], asyncio.Future] = {}
         self._stop = False
         self._poll_task: asyncio.Task | None = None
+        self._save_event = asyncio.Event()
+        self._save_task: asyncio.Task | None = None
         self._http: aiohttp.ClientSession | None = None
 
-        self._bindings: list[dict] = []
+        self._bindings: dict[str, dict] = {}
+        # (platform, group_id, sender_id) / (platform, group_id, steamid64) -> 绑定 id 有序集合
+        self._bindings_by_sender: dict[tuple[str, str, str], dict[str, None]] = {}
+        self._bindings_by_steam: dict[tuple[str, str, str], dict[str, None]] = {}
         self._game_subscriptions: list[dict] = []
 
     async def initialize(self):
@@ -132,13 +185,10 @@ class SteamWatch(Star):
 
         self._ensure_data_dir()
         await self._load_state()
-        self._http = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=20),
-            headers={"User-Agent": "astrbot-steam-watch-status/0.0.1"},
-            trust_env=False,
-        )
+        self._http = self._make_http_session()
         self._api.http = self._http
         self._stop = False
+        self._save_task = asyncio.create_task(self._save_loop())
         self._poll_task = asyncio.create_task(self._poll_loop())
         SteamWatch._global_poll_task = self._poll_task
         self._poll_log(
@@ -158,10 +208,22 @@ class SteamWatch(Star):
         if SteamWatch._global_poll_task is task:
             SteamWatch._global_poll_task = None
 
+        save_task = self._save_task
+        self._save_task = None
+        if save_task and not save_task.done():
+            # 有待写入的状态时等待写盘协程落盘后自行退出，否则直接取消。
+            if not self._save_event.is_set():
+                save_task.cancel()
+            try:
+                await save_task
+            except BaseException:
+                pass
+
         if self._http and not self._http.closed:
             await self._http.close()
         self._http = None
         self._api.http = None
+        self._api.close()
 
     @filter.command_group("steam")
     def steam(self):
@@ -171,7 +233,8 @@ class SteamWatch(Star):
     async def bind(
         self, event: AstrMessageEvent, steam: str | None = None, qq: str | None = None
     ):
-        if not event.get_group_id():
+        group_id = str(event.get_group_id() or "")
+        if not group_id:
             yield event.plain_result("请在群聊中执行绑定，状态变化会推送到该群。")
             event.stop_event()
             return
@@ -191,10 +254,9 @@ class SteamWatch(Star):
         if qq_target and qq_target == sender_id and qq_target != str(steam).strip():
             qq_target = ""
 
-        if qq_target:
-            qq_match = re.fullmatch(
-                r"(?:qq[:=])?(\d{5,12})", qq_target, flags=re.IGNORECASE
-            )
+        # 纯数字 QQ 号直接走快路径，仅带 qq: 前缀时才用正则
+        if qq_target and not (qq_target.isdecimal() and 5 <= len(qq_target) <= 12):
+            qq_match = self._bind_qq_arg_re.fullmatch(qq_target)
             if not qq_match:
                 yield event.plain_result(
                     "绑定失败：QQ 参数格式错误，请输入纯数字 QQ 号。"
@@ -223,7 +285,6 @@ class SteamWatch(Star):
 
         platform = event.get_platform_name() or "unknown"
         platform_id = str(event.get_platform_id() or "")
-        group_id = str(event.get_group_id() or "")
         session = str(event.unified_msg_origin or "")
         sender_name = str(event.get_sender_name() or "").strip()
         if qq_target and qq_target != sender_id:
@@ -232,34 +293,19 @@ class SteamWatch(Star):
         now_ts = int(time.time())
 
         async with self._lock:
-            for b in self._bindings:
-                if not isinstance(b, dict):
-                    continue
-                if (
-                    str(b.get("platform") or "") == platform
-                    and str(b.get("group_id") or "") == group_id
-                    and str(b.get("steamid64") or "") == steamid64
-                    and str(b.get("sender_id") or "") != bind_sender_id
-                ):
+            for b in self._find_bindings_by_steam(platform, group_id, steamid64):
+                if str(b.get("sender_id") or "") != bind_sender_id:
                     yield event.plain_result(
                         f"绑定失败：Steam 账号 {steam_name} 已被本群其他成员绑定。"
                     )
                     event.stop_event()
                     return
 
-            existing = None
-            for b in self._bindings:
-                if not isinstance(b, dict):
-                    continue
-                if (
-                    str(b.get("platform") or "") == platform
-                    and str(b.get("group_id") or "") == group_id
-                    and str(b.get("sender_id") or "") == bind_sender_id
-                ):
-                    existing = b
-                    break
-
-            if existing is None:
+            matches = self._find_bindings_by_sender(platform, group_id, bind_sender_id)
+            existing = matches[0] if matches else None
+            if existing is not None:
+                self._unindex_binding(existing)
+            else:
                 existing = {
                     "id": uuid.uuid4().hex,
                     "platform": platform,
@@ -269,7 +315,7 @@ class SteamWatch(Star):
                     "sender_id": bind_sender_id,
                     "created_ts": now_ts,
                 }
-                self._bindings.append(existing)
+                self._bindings[existing["id"]] = existing
 
             existing["platform"] = platform
             existing["platform_id"] = platform_id
@@ -295,6 +341,7 @@ class SteamWatch(Star):
                 if isinstance(existing.get("pending_endgame"), dict)
                 else None
             )
+            self._index_binding(existing)
 
             await self._save_state_unlocked()
 
@@ -452,6 +499,9 @@ class SteamWatch(Star):
             f"- llm_comment_timeout_sec: {self._llm_comment_timeout_sec}",
             f"- llm_comment_max_attempts: {self._llm_comment_max_attempts}",
             f"- llm_comment_concurrency: {self._llm_comment_concurrency}",
+            f"- cover_cache: {self._cover_cache.stats_text()}",
+            f"- avatar_cache: {self._avatar_cache.stats_text()}",
+            f"- nickname_cache: {self._nickname_cache.stats_text()}",
         ]
         if diag.get("svg_runtime") != "ok":
             lines.append("提示：请确认运行环境已安装 CairoSVG，并重启 AstrBot。")
@@ -483,46 +533,42 @@ class SteamWatch(Star):
         lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
         if lines:
             text = lines[0]
-        text = re.sub(r"\[CQ:[^\]]+\]", " ", text, flags=re.IGNORECASE)
-        text = re.sub(r"<@!?\d+>", " ", text)
-        text = re.sub(r"\s+", " ", text).strip()
+        text = SteamWatch._bind_payload_cq_re.sub(" ", text)
+        text = SteamWatch._bind_payload_mention_re.sub(" ", text)
+        text = SteamWatch._whitespace_re.sub(" ", text).strip()
         return text
 
     async def _handle_unbind(
         self, event: AstrMessageEvent, target: str | None = None
     ) -> str:
-        if not event.get_group_id():
+        group_id = str(event.get_group_id() or "")
+        if not group_id:
             return "请在群聊中执行解绑。"
 
         platform = event.get_platform_name() or "unknown"
-        group_id = str(event.get_group_id() or "")
         sender_id = str(event.get_sender_id() or "")
         target_text = str(target or "").strip()
         target_lower = target_text.lower()
+        remove_all = target_lower in {"all", "全部"}
+
+        # 解析 Steam 标识可能要走网络，放在锁外完成，避免阻塞其他绑定操作。
+        target_steamid64 = ""
+        if target_text and not remove_all:
+            if not self._find_bindings_by_sender(platform, group_id, sender_id):
+                return "你在本群还没有绑定，无需解绑。"
+            target_steamid64 = await self._resolve_steamid64(target_text) or ""
+            if not target_steamid64:
+                return "绑定失败：无法识别该 Steam 标识。"
 
         async with self._lock:
-            my_bindings = [
-                b
-                for b in self._bindings
-                if isinstance(b, dict)
-                and str(b.get("platform") or "") == platform
-                and str(b.get("group_id") or "") == group_id
-                and str(b.get("sender_id") or "") == sender_id
-            ]
+            my_bindings = self._find_bindings_by_sender(platform, group_id, sender_id)
             if not my_bindings:
                 return "你在本群还没有绑定，无需解绑。"
 
             if not target_text:
                 if len(my_bindings) == 1:
                     hit = my_bindings[0]
-                    hit_id = str(hit.get("id") or "")
-                    self._bindings = [
-                        b
-                        for b in self._bindings
-                        if not (
-                            isinstance(b, dict) and str(b.get("id") or "") == hit_id
-                        )
-                    ]
+                    self._remove_binding(str(hit.get("id") or ""))
                     await self._save_state_unlocked()
                     steamid64 = str(hit.get("steamid64") or "未知")
                     steam_name = str(hit.get("steam_name") or steamid64)
@@ -540,22 +586,14 @@ class SteamWatch(Star):
                 lines.append("- all (全部解绑)")
                 return "\n".join(lines)
 
-            if target_lower in {"all", "全部"}:
+            if remove_all:
                 remove_ids = {str(b.get("id") or "") for b in my_bindings}
-                self._bindings = [
-                    b
-                    for b in self._bindings
-                    if not (
-                        isinstance(b, dict) and str(b.get("id") or "") in remove_ids
-                    )
-                ]
+                for rid in remove_ids:
+                    self._remove_binding(rid)
                 await self._save_state_unlocked()
                 return f"解绑成功：已移除你在本群的 {len(remove_ids)} 条 Steam 绑定。"
 
-            steamid64 = await self._resolve_steamid64(str(target_text).strip())
-            if not steamid64:
-                return "绑定失败：无法识别该 Steam 标识。"
-
+            steamid64 = target_steamid64
             chosen = None
             for item in my_bindings:
                 if str(item.get("steamid64") or "").strip() == steamid64:
@@ -565,12 +603,7 @@ class SteamWatch(Star):
             if not chosen:
                 return "未找到该 steamid64 绑定，请输入 /steam unbind 查看可解绑列表。"
 
-            chosen_id = str(chosen.get("id") or "")
-            self._bindings = [
-                b
-                for b in self._bindings
-                if not (isinstance(b, dict) and str(b.get("id") or "") == chosen_id)
-            ]
+            self._remove_binding(str(chosen.get("id") or ""))
             await self._save_state_unlocked()
 
             steamid64 = str(chosen.get("steamid64") or steamid64)
@@ -584,21 +617,13 @@ class SteamWatch(Star):
             return "未配置 Steam Web API Key，请先在插件配置中填写。"
 
         target = (raw_target or "").strip()
-        if not target and event.get_group_id():
+        group_id = "" if target else str(event.get_group_id() or "")
+        if group_id:
             platform = event.get_platform_name() or "unknown"
-            group_id = str(event.get_group_id() or "")
             sender_id = str(event.get_sender_id() or "")
-            async with self._lock:
-                for b in self._bindings:
-                    if not isinstance(b, dict):
-                        continue
-                    if (
-                        str(b.get("platform") or "") == platform
-                        and str(b.get("group_id") or "") == group_id
-                        and str(b.get("sender_id") or "") == sender_id
-                    ):
-                        target = str(b.get("steamid64") or "").strip()
-                        break
+            matches = self._find_bindings_by_sender(platform, group_id, sender_id)
+            if matches:
+                target = str(matches[0].get("steamid64") or "").strip()
 
         if not target:
             return "用法：/steam 状态测试 [可选:好友码/64位id/好友链接/资料链接]（不填则测试你当前绑定）"
@@ -626,7 +651,8 @@ class SteamWatch(Star):
     async def _handle_subscribe_game(
         self, event: AstrMessageEvent, raw_game: str
     ) -> str:
-        if not event.get_group_id():
+        group_id = str(event.get_group_id() or "")
+        if not group_id:
             return "请在群聊中执行订阅，游戏更新会推送到该群。"
         if not raw_game:
             return "用法：/steam 订阅 [游戏链接/游戏id/游戏名称]"
@@ -638,7 +664,6 @@ class SteamWatch(Star):
             return "无法解析游戏，请输入正确的游戏链接、AppID 或游戏名称。"
 
         platform = event.get_platform_name() or "unknown"
-        group_id = event.get_group_id()
         now = int(time.time())
         latest_gid = await self._fetch_latest_news_gid(app["appid"])
         brief = await self._fetch_app_brief(int(app["appid"]))
@@ -773,28 +798,18 @@ class SteamWatch(Star):
         return ""
 
     async def _handle_me_status(self, event: AstrMessageEvent) -> str:
-        if not event.get_group_id():
+        group_id = str(event.get_group_id() or "")
+        if not group_id:
             return "请在群聊中执行 /steam me。"
 
         if not self.steam_web_api_key:
             return "未配置 Steam Web API Key，请先在插件配置中填写。"
 
         platform = event.get_platform_name() or "unknown"
-        group_id = str(event.get_group_id() or "")
         sender_id = str(event.get_sender_id() or "")
 
-        async with self._lock:
-            binding = None
-            for item in self._bindings:
-                if not isinstance(item, dict):
-                    continue
-                if (
-                    str(item.get("platform") or "") == platform
-                    and str(item.get("group_id") or "") == group_id
-                    and str(item.get("sender_id") or "") == sender_id
-                ):
-                    binding = dict(item)
-                    break
+        matches = self._find_bindings_by_sender(platform, group_id, sender_id)
+        binding = dict(matches[0]) if matches else None
 
         if not binding:
             return "你在本群还没有 Steam 绑定，请先使用 /steam bind 进行绑定。"
@@ -827,7 +842,7 @@ class SteamWatch(Star):
             playtime_text = await self._fetch_playtime_text(
                 steamid64=steamid64, appid=appid
             )
-        elif state in {"online", "offline"}:
+        elif state in self._presence_states:
             cover = await self._fetch_online_offline_cover()
 
         entries = [
@@ -855,23 +870,22 @@ class SteamWatch(Star):
         return "已发送你的 Steam 状态图。"
 
     async def _handle_list_status(self, event: AstrMessageEvent) -> str:
-        if not event.get_group_id():
+        group_id = str(event.get_group_id() or "")
+        if not group_id:
             return "请在群聊中执行 /steam list。"
 
         if not self.steam_web_api_key:
             return "未配置 Steam Web API Key，请先在插件配置中填写。"
 
         platform = event.get_platform_name() or "unknown"
-        group_id = str(event.get_group_id() or "")
 
-        async with self._lock:
-            bindings = [
-                dict(x)
-                for x in self._bindings
-                if isinstance(x, dict)
-                and str(x.get("platform") or "") == platform
-                and str(x.get("group_id") or "") == group_id
-            ]
+        bindings = [
+            dict(x)
+            for x in self._bindings.values()
+            if isinstance(x, dict)
+            and str(x.get("platform") or "") == platform
+            and str(x.get("group_id") or "") == group_id
+        ]
 
         if not bindings:
             return "当前群还没有绑定任何 Steam 账号。"
@@ -911,7 +925,7 @@ class SteamWatch(Star):
                 playtime_text = await self._fetch_playtime_text(
                     steamid64=steamid64, appid=appid
                 )
-            elif state in {"online", "offline"}:
+            elif state in self._presence_states:
                 cover = online_offline_cover
 
             entries.append(
@@ -942,15 +956,27 @@ class SteamWatch(Star):
         return "已发送当前群 Steam 绑定状态图。"
 
     async def _ensure_http_client(self) -> None:
-        if self._http and not self._http.closed:
+        if self._http is None or self._http.closed:
+            self._http = self._make_http_session()
             self._api.http = self._http
-            return
-        self._http = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=20),
+
+    @staticmethod
+    def _make_http_session() -> aiohttp.ClientSession:
+        # 保持连接跨轮询间隔存活，避免每轮都重新握手 TLS / 解析 DNS。
+        connector = aiohttp.TCPConnector(
+            keepalive_timeout=75,
+            limit=100,
+            limit_per_host=30,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            # 连接阶段单独限时，节点不可达时尽快失败而不是耗满总超时
+            timeout=aiohttp.ClientTimeout(total=20, connect=10),
             headers={"User-Agent": "astrbot-steam-watch-status/0.0.1"},
             trust_env=False,
         )
-        self._api.http = self._http
 
     async def _poll_loop(self) -> None:
         iteration = 0
@@ -959,23 +985,44 @@ class SteamWatch(Star):
                 iteration += 1
                 loop_start = time.perf_counter()
                 try:
-                    player_stats = await self._poll_player_status_once()
-                    news_stats = await self._poll_game_news_once()
-                    elapsed_ms = int((time.perf_counter() - loop_start) * 1000)
-                    self._poll_log(
-                        f"poll#{iteration} done | "
-                        f"bindings={player_stats.get('bindings', 0)} "
-                        f"valid_ids={player_stats.get('valid_ids', 0)} "
-                        f"players={player_stats.get('players', 0)} "
-                        f"changed_users={player_stats.get('changed_users', 0)} "
-                        f"changed_sessions={player_stats.get('changed_sessions', 0)} | "
-                        f"subs={news_stats.get('subscriptions', 0)} "
-                        f"pushed_news={news_stats.get('pushed_news', 0)} | "
-                        f"elapsed={elapsed_ms}ms | next_in={self.poll_interval_sec}s"
+                    # 单轮轮询设置上限，超时会连同取消两个子任务及其挂起的请求。
+                    player_stats, news_stats = await asyncio.wait_for(
+                        asyncio.gather(
+                            self._poll_player_status_once(),
+                            self._poll_game_news_once(),
+                            return_exceptions=True,
+                        ),
+                        timeout=self._poll_tick_timeout_sec(),
                     )
+                    if isinstance(player_stats, BaseException):
+                        logger.warning(
+                            f"steam watch player poll error: {player_stats!s}"
+                        )
+                        player_stats = {}
+                    if isinstance(news_stats, BaseException):
+                        logger.warning(f"steam watch news poll error: {news_stats!s}")
+                        news_stats = {}
+                    if self.verbose_poll_log:
+                        elapsed_ms = int((time.perf_counter() - loop_start) * 1000)
+                        self._poll_log(
+                            f"poll#{iteration} done | "
+                            f"bindings={player_stats.get('bindings', 0)} "
+                            f"valid_ids={player_stats.get('valid_ids', 0)} "
+                            f"players={player_stats.get('players', 0)} "
+                            f"changed_users={player_stats.get('changed_users', 0)} "
+                            f"changed_sessions={player_stats.get('changed_sessions', 0)} | "
+                            f"subs={news_stats.get('subscriptions', 0)} "
+                            f"pushed_news={news_stats.get('pushed_news', 0)} | "
+                            f"elapsed={elapsed_ms}ms | next_in={self.poll_interval_sec}s"
+                        )
                     await asyncio.sleep(self.poll_interval_sec)
                 except asyncio.CancelledError:
                     return
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"steam watch poll#{iteration} timed out after {self._poll_tick_timeout_sec()}s"
+                    )
+                    await asyncio.sleep(self.poll_interval_sec)
                 except Exception as exc:
                     logger.warning(f"steam watch poll error: {exc!s}")
                     await asyncio.sleep(20)
@@ -984,9 +1031,12 @@ class SteamWatch(Star):
             if SteamWatch._global_poll_task is current:
                 SteamWatch._global_poll_task = None
 
+    def _poll_tick_timeout_sec(self) -> int:
+        return max(self._poll_tick_min_timeout_sec, self.poll_interval_sec * 2)
+
     async def _poll_player_status_once(self) -> dict[str, int]:
-        async with self._lock:
-            bindings = [dict(x) for x in self._bindings if isinstance(x, dict)]
+        # 直接在原绑定对象上更新，不再逐条拷贝；被解绑的绑定不会参与落盘。
+        bindings = list(self._bindings.values())
 
         if not bindings:
             return {
@@ -997,11 +1047,11 @@ class SteamWatch(Star):
                 "changed_sessions": 0,
             }
 
-        ids = []
-        for b in bindings:
-            sid = str(b.get("steamid64") or "").strip()
-            if sid:
-                ids.append(sid)
+        ids = list(
+            dict.fromkeys(
+                sid for b in bindings if (sid := str(b.get("steamid64") or "").strip())
+            )
+        )
 
         players = await self._fetch_player_summaries(ids)
         if not players:
@@ -1013,9 +1063,14 @@ class SteamWatch(Star):
                 "changed_sessions": 0,
             }
 
-        updates: dict[str, dict] = {}
-        changes_by_session: dict[str, list[dict]] = {}
-        nickname_cache_by_group: dict[tuple[str, str, str], dict[str, str]] = {}
+        now_ts = int(time.time())
+        dirty_ids: set[str] = set()
+        changes_by_session: dict[str, list[dict]] = defaultdict(list)
+        # 第一遍只做差分：稳定状态的绑定仅刷新昵称/头像/最近状态，
+        # 只有发生变化（或首次记录、有待确认结束）的绑定进入第二遍状态机。
+        transitions: list[_PlayerTransition] = []
+        # 进入状态机且可能推送的绑定所在的群，稍后统一预取群名片
+        nickname_group_keys: dict[tuple[str, str, str], None] = {}
         for b in bindings:
             bid = str(b.get("id") or "").strip()
             sid = str(b.get("steamid64") or "").strip()
@@ -1024,49 +1079,94 @@ class SteamWatch(Star):
 
             player = players.get(sid)
             if not player:
-                updates[bid] = b
                 continue
 
             steam_name = str(player.get("personaname") or sid)
             avatar = str(player.get("avatarfull") or "")
             new_state, new_appid, new_game = self._extract_player_state(player)
-            old_state = str(b.get("last_state") or "")
-            old_appid = int(b.get("last_appid") or 0)
-
-            b["steam_name"] = steam_name
-            b["avatar_url"] = avatar
-
-            recent_states = b.get("recent_states")
-            if not isinstance(recent_states, list):
-                recent_states = []
-            recent_states = [str(x) for x in recent_states if x]
-            recent_states.append(new_state)
-            if len(recent_states) > 3:
-                recent_states = recent_states[-3:]
-            b["recent_states"] = recent_states
+            # 字段类型已在绑定/加载时规范化，这里直接比较，省去逐项强制转换。
+            old_state = b.get("last_state") or ""
+            old_appid = b.get("last_appid") or 0
+
+            if b.get("steam_name") != steam_name or b.get("avatar_url") != avatar:
+                b["steam_name"] = steam_name
+                b["avatar_url"] = avatar
+                dirty_ids.add(bid)
+            # 最近三次状态已全部相同时无需重建列表（稳定状态的常见情况）。
+            # 不原地 append：落盘线程可能正在序列化同一个列表。
+            recent_states = b.get("recent_states") or []
+            if len(recent_states) != 3 or recent_states.count(new_state) != 3:
+                b["recent_states"] = [*recent_states, new_state][-3:]
+                dirty_ids.add(bid)
             pending_endgame = b.get("pending_endgame")
-            if not isinstance(pending_endgame, dict):
-                pending_endgame = None
 
+            changed = new_state != old_state or (
+                new_state == "in_game" and new_appid != old_appid
+            )
+            if old_state and not changed and not pending_endgame:
+                continue
+            dirty_ids.add(bid)
+            transitions.append(
+                _PlayerTransition(
+                    binding=b,
+                    steamid64=sid,
+                    steam_name=steam_name,
+                    avatar=avatar,
+                    new_state=new_state,
+                    new_appid=new_appid,
+                    new_game=new_game,
+                    changed=changed,
+                )
+            )
+            group_id = str(b.get("group_id") or "")
+            if old_state and group_id:
+                group_key = (
+                    str(b.get("platform") or ""),
+                    str(b.get("platform_id") or ""),
+                    group_id,
+                )
+                nickname_group_keys[group_key] = None
+
+        # 并发预取群名片，状态机内部只做查表。
+        group_keys = list(nickname_group_keys)
+        nickname_maps = await asyncio.gather(
+            *(
+                self._get_group_nickname_map(
+                    platform=platform, platform_id=platform_id, group_id=group_id
+                )
+                for platform, platform_id, group_id in group_keys
+            ),
+            return_exceptions=True,
+        )
+        nickname_cache_by_group: dict[tuple[str, str, str], dict[str, str]] = {
+            key: m if isinstance(m, dict) else {}
+            for key, m in zip(group_keys, nickname_maps)
+        }
+
+        # 要推送的变化对应的状态字段在该会话推送完成后才写回绑定，
+        # 推送被取消或出错时下一轮仍能重新检测到这次变化。
+        deferred_by_session: dict[str, list[tuple[dict, dict]]] = defaultdict(list)
+        for t in transitions:
+            b = t.binding
+            sid = t.steamid64
+            new_state, new_appid, new_game = t.new_state, t.new_appid, t.new_game
+            # 第一遍未改动这些字段，直接从绑定读取。
+            old_state = b.get("last_state") or ""
+            old_appid = b.get("last_appid") or 0
+            pending_endgame = b.get("pending_endgame")
             if not old_state:
                 b["last_state"] = new_state
                 b["last_appid"] = new_appid
                 b["last_game_name"] = new_game
-                b["last_change_ts"] = int(time.time())
-                updates[bid] = b
+                b["last_change_ts"] = now_ts
                 continue
 
-            changed = new_state != old_state or (
-                new_state == "in_game" and int(new_appid or 0) != int(old_appid or 0)
-            )
-
             if (
                 pending_endgame
-                and not changed
-                and old_state in {"online", "offline"}
+                and not t.changed
+                and old_state in self._presence_states
                 and new_state == old_state
             ):
-                now_ts = int(time.time())
                 pending_start_ts = int(
                     pending_endgame.get("start_ts") or b.get("last_change_ts") or now_ts
                 )
@@ -1075,21 +1175,26 @@ class SteamWatch(Star):
                     pending_endgame.get("old_game") or b.get("last_game_name") or ""
                 )
                 session_secs = max(0, now_ts - pending_start_ts)
+                updates = {
+                    "pending_endgame": None,
+                    "in_game_since_ts": 0,
+                    "last_change_ts": now_ts,
+                }
 
                 session = str(b.get("session") or "").strip()
                 if session:
-                    latest_sender_name = await self._get_binding_latest_sender_name(
+                    latest_sender_name = self._get_binding_latest_sender_name(
                         binding=b,
                         nickname_cache_by_group=nickname_cache_by_group,
                     )
                     if latest_sender_name:
                         b["sender_name"] = latest_sender_name
-                    changes_by_session.setdefault(session, []).append(
+                    changes_by_session[session].append(
                         {
-                            "steam_name": steam_name,
+                            "steam_name": t.steam_name,
                             "group_nick": str(b.get("sender_name") or "未知成员"),
                             "steamid64": sid,
-                            "avatar_url": avatar,
+                            "avatar_url": t.avatar,
                             "old_state": "in_game",
                             "old_appid": pending_old_appid,
                             "old_game": pending_old_game,
@@ -1101,15 +1206,12 @@ class SteamWatch(Star):
                             "network_jitter": False,
                         }
                     )
-
-                b["pending_endgame"] = None
-                b["in_game_since_ts"] = 0
-                b["last_change_ts"] = now_ts
-                updates[bid] = b
+                    deferred_by_session[session].append((b, updates))
+                else:
+                    b.update(updates)
                 continue
 
-            if changed:
-                now_ts = int(time.time())
+            if t.changed:
                 old_game_name = str(b.get("last_game_name") or "")
                 old_in_game_since_ts = int(
                     b.get("in_game_since_ts") or b.get("last_change_ts") or now_ts
@@ -1120,9 +1222,10 @@ class SteamWatch(Star):
                 change_old_state = old_state
                 change_old_appid = int(old_appid or 0)
                 change_old_game = old_game_name
+                updates = {}
 
-                if old_state == "in_game" and new_state in {"online", "offline"}:
-                    b["pending_endgame"] = {
+                if old_state == "in_game" and new_state in self._presence_states:
+                    updates["pending_endgame"] = {
                         "old_appid": int(old_appid or 0),
                         "old_game": old_game_name,
                         "start_ts": old_in_game_since_ts,
@@ -1131,7 +1234,7 @@ class SteamWatch(Star):
                     emit_change = False
                 elif pending_endgame and new_state == "in_game":
                     pending_state = str(pending_endgame.get("pending_state") or "")
-                    is_network_jitter = pending_state in {"online", "offline"}
+                    is_network_jitter = pending_state in self._presence_states
                     change_old_state = pending_state or old_state
                     change_old_appid = int(
                         pending_endgame.get("old_appid") or old_appid
@@ -1139,11 +1242,11 @@ class SteamWatch(Star):
                     change_old_game = str(
                         pending_endgame.get("old_game") or old_game_name
                     )
-                    b["pending_endgame"] = None
+                    updates["pending_endgame"] = None
                 elif (
                     pending_endgame
-                    and old_state in {"online", "offline"}
-                    and new_state in {"online", "offline"}
+                    and old_state in self._presence_states
+                    and new_state in self._presence_states
                 ):
                     pending_start_ts = int(
                         pending_endgame.get("start_ts")
@@ -1158,27 +1261,27 @@ class SteamWatch(Star):
                         pending_endgame.get("old_game") or old_game_name
                     )
                     session_secs = max(0, now_ts - pending_start_ts)
-                    b["pending_endgame"] = None
-                elif old_state in {"online", "offline"} and new_state in {
-                    "online",
-                    "offline",
-                }:
+                    updates["pending_endgame"] = None
+                elif (
+                    old_state in self._presence_states
+                    and new_state in self._presence_states
+                ):
                     emit_change = False
 
                 session = str(b.get("session") or "").strip()
                 if emit_change and session:
-                    latest_sender_name = await self._get_binding_latest_sender_name(
+                    latest_sender_name = self._get_binding_latest_sender_name(
                         binding=b,
                         nickname_cache_by_group=nickname_cache_by_group,
                     )
                     if latest_sender_name:
                         b["sender_name"] = latest_sender_name
-                    changes_by_session.setdefault(session, []).append(
+                    changes_by_session[session].append(
                         {
-                            "steam_name": steam_name,
+                            "steam_name": t.steam_name,
                             "group_nick": str(b.get("sender_name") or "未知成员"),
                             "steamid64": sid,
-                            "avatar_url": avatar,
+                            "avatar_url": t.avatar,
                             "old_state": change_old_state,
                             "old_appid": change_old_appid,
                             "old_game": change_old_game,
@@ -1190,31 +1293,35 @@ class SteamWatch(Star):
                             "network_jitter": is_network_jitter,
                         }
                     )
-                b["last_state"] = new_state
-                b["last_appid"] = new_appid
-                b["last_game_name"] = new_game
-                b["last_change_ts"] = now_ts
+                updates["last_state"] = new_state
+                updates["last_appid"] = new_appid
+                updates["last_game_name"] = new_game
+                updates["last_change_ts"] = now_ts
                 if new_state == "in_game" and new_appid > 0:
-                    b["in_game_since_ts"] = now_ts
+                    updates["in_game_since_ts"] = now_ts
                 elif (
                     emit_change
                     and change_old_state == "in_game"
-                    and new_state in {"online", "offline"}
+                    and new_state in self._presence_states
                 ):
-                    b["in_game_since_ts"] = 0
-
-            updates[bid] = b
+                    updates["in_game_since_ts"] = 0
+                if emit_change and session:
+                    deferred_by_session[session].append((b, updates))
+                else:
+                    b.update(updates)
 
+        # 同一轮内多条变化共享封面/头像下载，避免重复拉取同一图片。
+        fetch_cache: dict[tuple[str, object], asyncio.Future] = {}
         for session, changes in changes_by_session.items():
-            await self._push_group_state_changes(session, changes)
+            await self._push_group_state_changes(
+                session, changes, fetch_cache=fetch_cache
+            )
+            for b, updates in deferred_by_session.pop(session, ()):
+                b.update(updates)
 
-        if updates:
+        # 仅当仍在册的绑定确有变化时落盘；全部未变时跳过。
+        if any(bid in self._bindings for bid in dirty_ids):
             async with self._lock:
-                self._bindings = [
-                    updates.get(str(old.get("id") or ""), old)
-                    for old in self._bindings
-                    if isinstance(old, dict)
-                ]
                 await self._save_state_unlocked()
 
         changed_users = sum(len(v) for v in changes_by_session.values())
@@ -1254,12 +1361,55 @@ class SteamWatch(Star):
                     if normalized:
                         binding["sender_name"] = normalized
 
+    async def _get_group_nickname_map(
+        self,
+        *,
+        platform: str,
+        platform_id: str,
+        group_id: str,
+    ) -> dict[str, str]:
+        # 群名片跨轮询缓存一段时间；同一群的并发请求共用一次拉取。
+        # 拉取失败（空表）不缓存，下一轮重试。
+        key = (platform, platform_id, group_id)
+        nickname_map = self._nickname_cache.get(key)
+        if nickname_map is not None:
+            return nickname_map
+
+        nickname_map = await single_flight(
+            self._nickname_inflight,
+            key,
+            self._fetch_bound_member_nicknames,
+            platform,
+            platform_id,
+            group_id,
+        )
+        if nickname_map:
+            self._nickname_cache.set(key, nickname_map)
+        return nickname_map
+
+    async def _fetch_bound_member_nicknames(
+        self, platform: str, platform_id: str, group_id: str
+    ) -> dict[str, str]:
+        # 只保留本群已绑定成员的名片，大群不必缓存整张成员表
+        wanted = {
+            sender_id
+            for p, g, sender_id in self._bindings_by_sender
+            if p == platform and g == group_id
+        }
+        return await self._fetch_group_nickname_map(
+            platform=platform,
+            platform_id=platform_id,
+            group_id=group_id,
+            wanted=wanted,
+        )
+
     async def _fetch_group_nickname_map(
         self,
         *,
         platform: str,
         platform_id: str,
         group_id: str,
+        wanted: set[str] | None = None,
     ) -> dict[str, str]:
         if platform != "aiocqhttp":
             return {}
@@ -1292,21 +1442,27 @@ class SteamWatch(Star):
         if not isinstance(data, list):
             return {}
 
+        # 大群成员列表可能上千条，这里只对真正有值的字段做转换。
         out: dict[str, str] = {}
         for item in data:
             if not isinstance(item, dict):
                 continue
-            user_id = str(item.get("user_id") or "").strip()
+            user_id = item.get("user_id")
             if not user_id:
                 continue
-            card = str(item.get("card") or "").strip()
-            nick = str(item.get("nickname") or item.get("nick") or "").strip()
-            name = card or nick
+            user_id = str(user_id).strip()
+            if wanted is not None and user_id not in wanted:
+                continue
+            name = item.get("card")
+            name = name.strip() if isinstance(name, str) else ""
+            if not name:
+                name = item.get("nickname") or item.get("nick")
+                name = name.strip() if isinstance(name, str) else ""
             if name:
                 out[user_id] = name
         return out
 
-    async def _get_binding_latest_sender_name(
+    def _get_binding_latest_sender_name(
         self,
         *,
         binding: dict,
@@ -1322,34 +1478,37 @@ class SteamWatch(Star):
             return current_name
 
         group_key = (platform, platform_id, group_id)
-        if group_key not in nickname_cache_by_group:
-            nickname_cache_by_group[group_key] = await self._fetch_group_nickname_map(
-                platform=platform,
-                platform_id=platform_id,
-                group_id=group_id,
-            )
-
         latest = str(
             nickname_cache_by_group.get(group_key, {}).get(sender_id) or ""
         ).strip()
         return latest or current_name
 
     async def _push_group_state_changes(
-        self, session: str, changes: list[dict]
+        self,
+        session: str,
+        changes: list[dict],
+        *,
+        fetch_cache: dict[tuple[str, object], asyncio.Future] | None = None,
     ) -> None:
         if not session or not changes:
             return
 
-        enriched_list = await asyncio.gather(
-            *(self._build_change_entry(c, session=session) for c in changes),
-            return_exceptions=True,
-        )
+        if fetch_cache is None:
+            fetch_cache = {}
 
-        enriched: list[dict] = []
-        for item in enriched_list:
-            if isinstance(item, Exception) or not isinstance(item, dict):
-                continue
-            enriched.append(item)
+        # 限制同时构建的条目数，避免大批量变化时头像/封面/LLM 请求一拥而上。
+        async def _build(change: dict) -> dict | None:
+            async with self._change_entry_sem:
+                try:
+                    return await self._build_change_entry(
+                        change, session=session, fetch_cache=fetch_cache
+                    )
+                except Exception as exc:
+                    logger.debug(f"build change entry failed: {exc!s}")
+                    return None
+
+        enriched_list = await asyncio.gather(*(_build(c) for c in changes))
+        enriched = [item for item in enriched_list if item is not None]
 
         if not enriched:
             return
@@ -1359,7 +1518,15 @@ class SteamWatch(Star):
             return
         await self._send_message_with_optional_image(session, image_path=card)
 
-    async def _build_change_entry(self, change: dict, *, session: str) -> dict:
+    async def _build_change_entry(
+        self,
+        change: dict,
+        *,
+        session: str,
+        fetch_cache: dict[tuple[str, object], asyncio.Future] | None = None,
+    ) -> dict:
+        if fetch_cache is None:
+            fetch_cache = {}
         steam_name = str(change.get("steam_name") or "未知")
         group_nick = str(change.get("group_nick") or "未知成员")
         display_name = f"{steam_name}({group_nick})"
@@ -1375,20 +1542,35 @@ class SteamWatch(Star):
         network_jitter = bool(change.get("network_jitter"))
         render_state = new_state
 
-        avatar = await self._fetch_image_pil(avatar_url)
+        avatar = await single_flight(
+            fetch_cache,
+            ("avatar", avatar_url),
+            self._fetch_image_pil,
+            avatar_url,
+            keep=True,
+        )
         cover = None
         playtime_text = ""
         comment_text = ""
 
-        if new_state == "in_game" and appid > 0:
+        kind = self._transition_kind(old_state, new_state)
+        if kind == "start" and appid > 0:
             playtime_text = await self._fetch_playtime_text(
                 steamid64=steamid64, appid=appid
             )
-            cover = await self._fetch_cover_image(appid)
+            cover = await single_flight(
+                fetch_cache, ("cover", appid), self._fetch_cover_image, appid, keep=True
+            )
             status_desc = f"开始游戏：{game_name}"
-        elif old_state == "in_game" and new_state in {"online", "offline"}:
+        elif kind == "end":
             if old_appid > 0:
-                cover = await self._fetch_cover_image(old_appid)
+                cover = await single_flight(
+                    fetch_cache,
+                    ("cover", old_appid),
+                    self._fetch_cover_image,
+                    old_appid,
+                    keep=True,
+                )
             if old_game:
                 game_name = old_game
             if session_secs > 0:
@@ -1396,20 +1578,33 @@ class SteamWatch(Star):
             else:
                 playtime_text = "未知"
             if self.llm_comment_enabled:
-                comment_text = await self._generate_llm_comment(
-                    session=session,
-                    display_name=display_name,
-                    game_name=game_name or "该游戏",
-                    duration_text=playtime_text,
-                )
+                try:
+                    comment_text = await asyncio.wait_for(
+                        self._generate_llm_comment(
+                            session=session,
+                            display_name=display_name,
+                            game_name=game_name or "该游戏",
+                            duration_text=playtime_text,
+                        ),
+                        timeout=self._llm_comment_budget_sec,
+                    )
+                except asyncio.TimeoutError:
+                    logger.debug(
+                        f"llm comment skipped after {self._llm_comment_budget_sec}s"
+                    )
             status_desc = "游戏结束"
             render_state = "ended"
         else:
             status_desc = (
                 f"{self._state_text(old_state)} -> {self._state_text(new_state)}"
             )
-            if new_state in {"online", "offline"}:
-                cover = await self._fetch_online_offline_cover()
+            if new_state in self._presence_states:
+                cover = await single_flight(
+                    fetch_cache,
+                    ("grid", 0),
+                    self._fetch_online_offline_cover,
+                    keep=True,
+                )
 
         if network_jitter:
             status_desc = "网络波动"
@@ -1426,6 +1621,14 @@ class SteamWatch(Star):
             "new_state": render_state,
         }
 
+    @classmethod
+    def _transition_kind(cls, old_state: str, new_state: str) -> str:
+        old_code = cls._state_codes.get(old_state)
+        new_code = cls._state_codes.get(new_state)
+        if old_code is None or new_code is None:
+            return "presence"
+        return cls._transition_kinds[old_code][new_code]
+
     async def _generate_llm_comment(
         self,
         *,
@@ -1434,6 +1637,11 @@ class SteamWatch(Star):
         game_name: str,
         duration_text: str,
     ) -> str:
+        # 时长未知或游戏名为占位时模型没有可评价的信息，直接跳过，避免白等超时。
+        if not game_name or game_name == "该游戏" or duration_text.endswith("未知"):
+            return ""
+        if self._llm_comment_disabled_until > time.monotonic():
+            return ""
         provider = self._resolve_comment_provider(session)
         if not provider or not isinstance(provider, Provider):
             return ""
@@ -1444,6 +1652,9 @@ class SteamWatch(Star):
             duration_text=duration_text,
         )
         async with self._llm_comment_lock:
+            # 排队期间熔断可能已打开
+            if self._llm_comment_disabled_until > time.monotonic():
+                return ""
             for attempt in range(1, self._llm_comment_max_attempts + 1):
                 try:
                     resp = await asyncio.wait_for(
@@ -1451,35 +1662,65 @@ class SteamWatch(Star):
                         timeout=self._llm_comment_timeout_sec,
                     )
                     text = (getattr(resp, "completion_text", "") or "").strip()
-                    text = re.sub(r"\s+", " ", text)
-                    text = text.replace("\n", " ").strip(" \"'“”‘’")
+                    text = self._whitespace_re.sub(" ", text)
+                    text = text.strip(self._llm_comment_strip_chars)
                     if len(text) > 28:
-                        text = text[:28].rstrip("，。,.!?！？") + "。"
+                        text = text[:28].rstrip(self._llm_comment_tail_punct) + "。"
                     if text:
+                        self._llm_comment_failures = 0
                         return text
                     logger.debug(
                         f"llm comment empty response, attempt={attempt}/{self._llm_comment_max_attempts}"
                     )
+                except asyncio.CancelledError:
+                    # 外层预算超时会在请求途中取消，同样计入失败，否则熔断永远不会触发。
+                    self._record_llm_comment_failure()
+                    raise
                 except Exception as exc:
                     logger.debug(
                         f"llm comment generate failed, attempt={attempt}/{self._llm_comment_max_attempts}: {exc!s}"
                     )
+                self._record_llm_comment_failure()
+                if self._llm_comment_disabled_until > time.monotonic():
+                    break
                 if attempt < self._llm_comment_max_attempts:
                     await asyncio.sleep(0.35 * attempt)
         return ""
 
+    def _record_llm_comment_failure(self) -> None:
+        self._llm_comment_failures += 1
+        if self._llm_comment_failures < self._llm_comment_breaker_threshold:
+            return
+        self._llm_comment_failures = 0
+        self._llm_comment_disabled_until = (
+            time.monotonic() + self._llm_comment_breaker_cooldown_sec
+        )
+        logger.warning(
+            f"llm comment failed {self._llm_comment_breaker_threshold} times "
+            f"in a row, pausing for {self._llm_comment_breaker_cooldown_sec}s"
+        )
+
     def _resolve_comment_provider(self, session: str):
         if self.llm_provider_id:
+            key = ("id", self.llm_provider_id)
+            provider = self._provider_cache.get(key)
+            if provider is not None:
+                return provider
             try:
                 provider = self.context.get_provider_by_id(self.llm_provider_id)
                 if provider is not None:
+                    self._provider_cache.set(key, provider)
                     return provider
             except Exception as exc:
                 logger.debug(f"resolve llm provider by id failed: {exc!s}")
         if session:
+            provider = self._provider_cache.get(session)
+            if provider is not None:
+                return provider
             try:
                 provider = self.context.get_using_provider(umo=session)
                 if provider is not None:
+                    self._provider_cache.set(session, provider)
                     return provider
             except Exception as exc:
                 logger.debug(f"resolve llm provider by session failed: {exc!s}")
@@ -1515,26 +1756,45 @@ class SteamWatch(Star):
         return f"{hours}时{minutes}分{sec}秒"
 
     async def _poll_game_news_once(self) -> dict[str, int]:
-        async with self._lock:
-            subs = [dict(x) for x in self._game_subscriptions if isinstance(x, dict)]
+        if not self._game_subscriptions:
+            return {"subscriptions": 0, "pushed_news": 0}
+        # 直接在原订阅对象上更新，只有字段确有变化时才落盘。
+        subs = [x for x in self._game_subscriptions if isinstance(x, dict)]
         if not subs:
             return {"subscriptions": 0, "pushed_news": 0}
 
-        updates: dict[str, dict] = {}
+        # 先并发拉取各订阅游戏的最新公告与商店信息（同一 appid 只拉一次），再逐条比对推送。
+        fetch_sem = asyncio.Semaphore(10)
+
+        async def _fetch_app_updates(appid: int) -> tuple[dict | None, dict | None]:
+            async with fetch_sem:
+                latest, brief = await asyncio.gather(
+                    self._fetch_latest_news(appid),
+                    self._fetch_app_brief(appid),
+                )
+                return latest, brief
+
+        appids = list(
+            dict.fromkeys(
+                appid for s in subs if (appid := int(s.get("appid") or 0)) > 0
+            )
+        )
+        fetched = await asyncio.gather(*(_fetch_app_updates(appid) for appid in appids))
+        app_updates = dict(zip(appids, fetched))
+
+        dirty = False
         pushed_news = 0
+        # 同一轮内同一游戏的公告卡与特卖卡共用一张封面
+        covers: dict[int, object] = {}
         for s in subs:
             sid = str(s.get("id") or "").strip()
             if not sid:
                 continue
             appid = int(s.get("appid") or 0)
             if appid <= 0:
-                updates[sid] = s
                 continue
 
-            latest = await self._fetch_latest_news(appid)
-            if not latest:
-                updates[sid] = s
-            app_brief = await self._fetch_app_brief(appid)
+            latest, app_brief = app_updates.get(appid, (None, None))
 
             old_gid = str(s.get("last_news_gid") or "")
             new_gid = str((latest or {}).get("gid") or "")
@@ -1545,6 +1805,8 @@ class SteamWatch(Star):
                 author = str(latest.get("author") or "Steam News")
                 contents = str(latest.get("contents") or "")
                 date_ts = int(latest.get("date") or 0)
+                if appid not in covers:
+                    covers[appid] = await self._fetch_cover_image(appid)
                 card = await self._render_news_card(
                     appid=appid,
                     game_name=game_name,
@@ -1552,6 +1814,7 @@ class SteamWatch(Star):
                     author=author,
                     date_ts=date_ts,
                     contents=contents,
+                    cover=covers[appid],
                 )
 
                 text = f"[Steam更新] {game_name}\n{title}"
@@ -1595,6 +1858,8 @@ class SteamWatch(Star):
                     if desc:
                         body = f"{body}\n{desc}"
 
+                    if appid not in covers:
+                        covers[appid] = await self._fetch_cover_image(appid)
                     sale_card = await self._render_news_card(
                         appid=appid,
                         game_name=game_name,
@@ -1603,6 +1868,7 @@ class SteamWatch(Star):
                         date_ts=int(time.time()),
                         contents=body,
                         price_text=price_text,
+                        cover=covers[appid],
                     )
                     if sale_card:
                         await self._send_message_with_optional_image(
@@ -1611,21 +1877,24 @@ class SteamWatch(Star):
                         )
                         pushed_news += 1
 
-                s["last_price_text"] = str(app_brief.get("price_text") or "未知")
-                s["last_price_cents"] = int(app_brief.get("price_final_cents") or -1)
-                s["last_discount_percent"] = int(app_brief.get("discount_percent") or 0)
-                s["last_is_free"] = bool(app_brief.get("is_free"))
+                fields = {
+                    "last_price_text": str(app_brief.get("price_text") or "未知"),
+                    "last_price_cents": int(app_brief.get("price_final_cents") or -1),
+                    "last_discount_percent": int(
+                        app_brief.get("discount_percent") or 0
+                    ),
+                    "last_is_free": bool(app_brief.get("is_free")),
+                    "last_news_gid": new_gid or old_gid,
+                }
+            else:
+                fields = {"last_news_gid": new_gid or old_gid}
 
-            s["last_news_gid"] = new_gid or old_gid
-            updates[sid] = s
+            if any(s.get(k) != v for k, v in fields.items()):
+                s.update(fields)
+                dirty = True
 
-        if updates:
+        if dirty:
             async with self._lock:
-                self._game_subscriptions = [
-                    updates.get(str(old.get("id") or ""), old)
-                    for old in self._game_subscriptions
-                    if isinstance(old, dict)
-                ]
                 await self._save_state_unlocked()
         return {"subscriptions": len(subs), "pushed_news": pushed_news}
 
@@ -1709,8 +1978,10 @@ class SteamWatch(Star):
         date_ts: int,
         contents: str,
         price_text: str | None = None,
+        cover=None,
     ) -> str | None:
-        cover = await self._fetch_cover_image(appid)
+        if cover is None:
+            cover = await self._fetch_cover_image(appid)
         return await self._renderer.render_news_card(
             appid=appid,
             game_name=game_name,
@@ -1779,22 +2050,154 @@ class SteamWatch(Star):
                 self._cleanup_sent_image(image)
 
     async def _fetch_cover_image(self, appid: int):
-        return await self._api.fetch_cover_image(appid)
+        cover = self._cover_cache.get(appid)
+        if cover is None:
+            cover = await self._api.fetch_cover_image(appid)
+            if cover is not None:
+                self._cover_cache.set(appid, cover)
+        return cover
 
     async def _fetch_online_offline_cover(self):
-        return await self._api.fetch_grid_image_by_id(self._online_offline_grid_id)
+        key = ("grid", self._online_offline_grid_id)
+        cover = self._cover_cache.get(key)
+        if cover is None:
+            cover = await self._api.fetch_grid_image_by_id(self._online_offline_grid_id)
+            if cover is not None:
+                self._cover_cache.set(key, cover)
+        return cover
 
     async def _fetch_image_pil(self, url: str):
-        return await self._api.fetch_image_pil(url)
+        image = self._avatar_cache.get(url)
+        if image is None:
+            image = await self._api.fetch_image_pil(url)
+            if image is not None:
+                self._avatar_cache.set(url, image)
+        return image
 
     def _ensure_data_dir(self) -> None:
         self._store.ensure_data_dir()
 
     async def _load_state(self) -> None:
-        self._bindings, self._game_subscriptions = await self._store.load_state()
+        bindings, self._game_subscriptions = await self._store.load_state()
+        self._bindings = {}
+        for b in bindings:
+            if not isinstance(b, dict):
+                continue
+            bid = str(b.get("id") or "").strip()
+            if not bid:
+                bid = uuid.uuid4().hex
+            b["id"] = bid
+            self._normalize_binding(b)
+            self._bindings[bid] = b
+        self._bindings_by_sender = {}
+        self._bindings_by_steam = {}
+        for b in self._bindings.values():
+            self._index_binding(b)
+
+    @staticmethod
+    def _binding_index_keys(
+        b: dict,
+    ) -> tuple[tuple[str, str, str], tuple[str, str, str]]:
+        platform = str(b.get("platform") or "")
+        group_id = str(b.get("group_id") or "")
+        return (
+            (platform, group_id, str(b.get("sender_id") or "")),
+            (platform, group_id, str(b.get("steamid64") or "")),
+        )
+
+    def _index_binding(self, b: dict) -> None:
+        bid = str(b.get("id") or "")
+        sender_key, steam_key = self._binding_index_keys(b)
+        self._bindings_by_sender.setdefault(sender_key, {})[bid] = None
+        self._bindings_by_steam.setdefault(steam_key, {})[bid] = None
+        self._drop_group_nickname_cache(b)
+
+    def _unindex_binding(self, b: dict) -> None:
+        bid = str(b.get("id") or "")
+        sender_key, steam_key = self._binding_index_keys(b)
+        self._drop_group_nickname_cache(b)
+        for index, key in (
+            (self._bindings_by_sender, sender_key),
+            (self._bindings_by_steam, steam_key),
+        ):
+            ids = index.get(key)
+            if ids is None:
+                continue
+            ids.pop(bid, None)
+            if not ids:
+                del index[key]
+
+    def _drop_group_nickname_cache(self, b: dict) -> None:
+        # 缓存的名片表只含拉取时已绑定的成员，绑定变化后需重新拉取
+        self._nickname_cache.pop(
+            (
+                str(b.get("platform") or ""),
+                str(b.get("platform_id") or ""),
+                str(b.get("group_id") or ""),
+            )
+        )
+
+    def _remove_binding(self, bid: str) -> dict | None:
+        b = self._bindings.pop(bid, None)
+        if b is not None:
+            self._unindex_binding(b)
+        return b
+
+    def _find_bindings_by_sender(
+        self, platform: str, group_id: str, sender_id: str
+    ) -> list[dict]:
+        ids = self._bindings_by_sender.get((platform, group_id, sender_id), {})
+        return [self._bindings[bid] for bid in ids]
+
+    def _find_bindings_by_steam(
+        self, platform: str, group_id: str, steamid64: str
+    ) -> list[dict]:
+        ids = self._bindings_by_steam.get((platform, group_id, steamid64), {})
+        return [self._bindings[bid] for bid in ids]
+
+    @staticmethod
+    def _normalize_binding(b: dict) -> None:
+        b["steamid64"] = str(b.get("steamid64") or "").strip()
+        b["last_state"] = str(b.get("last_state") or "")
+        b["last_appid"] = int(b.get("last_appid") or 0)
+        b["last_game_name"] = str(b.get("last_game_name") or "")
+        b["last_change_ts"] = int(b.get("last_change_ts") or 0)
+        b["in_game_since_ts"] = int(b.get("in_game_since_ts") or 0)
+        recent_states = b.get("recent_states")
+        b["recent_states"] = (
+            [str(x) for x in recent_states if x]
+            if isinstance(recent_states, list)
+            else []
+        )
+        if not isinstance(b.get("pending_endgame"), dict):
+            b["pending_endgame"] = None
 
     async def _save_state_unlocked(self) -> None:
-        await self._store.save_state(self._bindings, self._game_subscriptions)
+        if self._save_task is None or self._save_task.done():
+            await self._store.save_state(
+                list(self._bindings.values()), self._game_subscriptions
+            )
+            return
+        self._save_event.set()
+
+    async def _save_loop(self) -> None:
+        # 合并短时间内的多次保存请求，只写一次盘。
+        while True:
+            if self._stop and not self._save_event.is_set():
+                return
+            await self._save_event.wait()
+            if not self._stop:
+                await asyncio.sleep(0.5)
+            self._save_event.clear()
+            try:
+                await self._flush_state()
+            except Exception as exc:
+                logger.warning(f"save steam watch state failed: {exc!s}")
+
+    async def _flush_state(self) -> None:
+        bindings = [dict(b) for b in self._bindings.values()]
+        subs = [dict(s) for s in self._game_subscriptions if isinstance(s, dict)]
+        await self._store.save_state(bindings, subs)
 
     @staticmethod
     def _parse_poll_interval_sec(raw: object) -> int:
@@ -3,12 +3,20 @@ from __future__ import annotations
 import asyncio
 import io
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import aiohttp
 
 from astrbot.api import logger
 
+from .steam_cache import TtlLruCache, single_flight
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
 try:
     from PIL import Image
 except Exception:  # pragma: no cover
@@ -17,8 +25,39 @@ except Exception:  # pragma: no cover
 
 STEAM_ID64_BASE = 76561197960265728
 
+_STATE_OFFLINE = ("offline", 0, "")
+_STATE_ONLINE = ("online", 0, "")
+_STATE_TEXTS = {"in_game": "游戏中", "online": "在线", "offline": "离线"}
+
 
 class SteamApi:
+    # 资料链接的三种形式合并为一个模式：profiles/<64位id>、id/<自定义>、addfriend/<好友码>
+    _steamid_url_re = re.compile(
+        r"steamcommunity\.com/(?:profiles/(?P<sid>\d{17})(?:/|$)"
+        r"|id/(?P<vanity>[^/?#]{1,64})(?:[/?#]|\Z)"
+        r"|addfriend/(?P<acc>\d+)(?:/|$))",
+        flags=re.IGNORECASE,
+    )
+    _s_team_url_re = re.compile(
+        r"(https?://s\.team/p/[A-Za-z0-9\-]+)", flags=re.IGNORECASE
+    )
+    # 页面正文里的链接没有结尾分隔要求；三种形式合并为一个模式，只扫一遍正文
+    _steamid_text_re = re.compile(
+        r"steamcommunity\.com/(?:profiles/(?P<sid>\d{17})|addfriend/(?P<acc>\d+)"
+        r"|id/(?P<vanity>[^/?#\"'\s]{1,64}))",
+        flags=re.IGNORECASE,
+    )
+    # 标识两端可能带的引号/尖括号及空白（含全角空格）
+    _target_strip_chars = "\"'<> \t\r\n\u3000"
+    # 封面/头像远小于此；超出的响应不下载，避免异常大图占用内存
+    _max_image_bytes = 8 * 1024 * 1024
+    # 卡片中封面最大显示 280x460（object-fit: cover，设备像素 2 倍需 560x920），
+    # 竖版封面按高度 920 缩放时宽约 613，故上限取 920x920
+    _max_image_size = (920, 920)
+    _store_app_re = re.compile(
+        r"store\.steampowered\.com/app/(\d+)", flags=re.IGNORECASE
+    )
+
     def __init__(
         self,
         steam_web_api_key: str,
@@ -31,10 +70,31 @@ class SteamApi:
         self.isthereanydeal_api_key = (isthereanydeal_api_key or "").strip()
         self.http_proxy = (http_proxy or "").strip()
         self.http: aiohttp.ClientSession | None = None
+        # 游戏名与自定义链接在一段时间内基本不变，缓存成功结果避免重复请求
+        self._app_name_cache = TtlLruCache(maxsize=256, ttl_sec=3600)
+        self._vanity_cache = TtlLruCache(maxsize=256, ttl_sec=3600)
+        # 进行中的请求，相同请求同时发起时共用一次网络调用
+        self._inflight: dict[tuple[str, object], asyncio.Future] = {}
+        # appid -> (ETag, 上次的最新公告)，用于条件请求；服务端未返回 ETag 时不记录
+        self._news_etags = TtlLruCache(maxsize=256, ttl_sec=86400)
+        # 图片解码使用独立的小线程池，避免并发拉图时占满默认执行器
+        self._decode_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="steam-img"
+        )
+
+    def close(self) -> None:
+        self._decode_pool.shutdown(wait=False)
 
     def _http(self) -> aiohttp.ClientSession | None:
         return self.http
 
+    @staticmethod
+    async def _read_json(resp: aiohttp.ClientResponse):
+        if orjson is None:
+            return await resp.json(content_type=None)
+        raw = await resp.read()
+        return orjson.loads(raw) if raw.strip() else None
+
     def _proxy(self) -> str | None:
         proxy = str(self.http_proxy or "").strip()
         if not proxy:
@@ -46,46 +106,35 @@ class SteamApi:
         if not text:
             return None
 
-        m = re.search(
-            r"steamcommunity\.com/profiles/(\d{17})(?:/|$)", text, re.IGNORECASE
-        )
-        if m:
-            return m.group(1)
-
-        m = re.search(r"steamcommunity\.com/id/([^/?#]+)(?:/|$)", text, re.IGNORECASE)
-        if m:
-            return await self._resolve_vanity(m.group(1))
-
-        m = re.search(
-            r"steamcommunity\.com/addfriend/(\d+)(?:/|$)", text, re.IGNORECASE
-        )
-        if m:
-            acc = int(m.group(1))
-            return str(STEAM_ID64_BASE + acc)
-
-        if "s.team/p/" in text.lower():
+        # 纯数字（64 位 id / 好友码）最常见，直接换算，跳过链接正则匹配。
+        # 与原先的 \d 一致接受全角数字（中文输入法常见），int() 可直接换算。
+        if text.isdecimal():
+            if len(text) == 17:
+                return text if text.isascii() else str(int(text))
+            if len(text) <= 12:
+                val = int(text)
+                if val > STEAM_ID64_BASE:
+                    return str(val)
+                return str(STEAM_ID64_BASE + val)
+
+        # 不含链接特征的输入（自定义 id）直接跳过正则
+        lower = text.lower()
+        if "steamcommunity.com" in lower:
+            m = self._steamid_url_re.search(text)
+            if m:
+                return await self._steamid_from_url_match(m)
+
+        if "s.team/p/" in lower:
             from_link = await self._resolve_s_team_link(text)
             if from_link:
                 return from_link
 
-        if re.fullmatch(r"\d{17}", text):
-            return text
-
-        if re.fullmatch(r"\d{1,12}", text):
-            val = int(text)
-            if val > STEAM_ID64_BASE:
-                return str(val)
-            return str(STEAM_ID64_BASE + val)
-
         return await self._resolve_vanity(text)
 
     @staticmethod
     def _normalize_target(raw: str | None) -> str:
-        text = (raw or "").strip()
-        text = text.strip("\"'")
-        text = text.strip("<>")
-        text = text.strip()
-        return text
+        # 正常的 Steam 链接/标识远短于此，超长输入直接截断，不交给正则
+        return (raw or "")[:4096].strip().strip(SteamApi._target_strip_chars)
 
     async def _resolve_short_link_to_steamid(self, url: str) -> str | None:
         http = self._http()
@@ -94,6 +143,10 @@ class SteamApi:
         try:
             async with http.get(url, allow_redirects=True, proxy=self._proxy()) as resp:
                 final_url = str(resp.url)
+                # 跳转后的地址已带 64 位 id / 好友码时无需下载页面正文
+                m = self._steamid_url_re.search(final_url)
+                if m and not m.group("vanity"):
+                    return await self._steamid_from_url_match(m)
                 page_text = await resp.text(errors="ignore")
 
             from_final = await self._resolve_steamid_from_any_url(final_url)
@@ -111,7 +164,7 @@ class SteamApi:
         if out:
             return out
 
-        m = re.search(r"(https?://s\.team/p/[A-Za-z0-9\-]+)", u, re.IGNORECASE)
+        m = self._s_team_url_re.search(u)
         if m:
             out = await self._resolve_short_link_to_steamid(m.group(1))
             if out:
@@ -121,41 +174,54 @@ class SteamApi:
     async def _resolve_steamid_from_any_url(self, url: str) -> str | None:
         if not url:
             return None
-        m = re.search(
-            r"steamcommunity\.com/profiles/(\d{17})(?:/|$)", url, re.IGNORECASE
-        )
-        if m:
-            return m.group(1)
-
-        m = re.search(r"steamcommunity\.com/addfriend/(\d+)(?:/|$)", url, re.IGNORECASE)
+        m = self._steamid_url_re.search(url)
         if m:
-            return str(STEAM_ID64_BASE + int(m.group(1)))
-
-        m = re.search(r"steamcommunity\.com/id/([^/?#]+)(?:/|$)", url, re.IGNORECASE)
-        if m:
-            return await self._resolve_vanity(m.group(1))
+            return await self._steamid_from_url_match(m)
         return None
 
+    async def _steamid_from_url_match(self, m: re.Match) -> str | None:
+        if m.group("sid"):
+            return m.group("sid")
+        if m.group("acc"):
+            return str(STEAM_ID64_BASE + int(m.group("acc")))
+        return await self._resolve_vanity(m.group("vanity"))
+
     async def _extract_steamid_from_text(self, text: str) -> str | None:
         if not text:
             return None
-        m = re.search(r"steamcommunity\.com/profiles/(\d{17})", text, re.IGNORECASE)
-        if m:
-            return m.group(1)
-
-        m = re.search(r"steamcommunity\.com/addfriend/(\d+)", text, re.IGNORECASE)
-        if m:
-            return str(STEAM_ID64_BASE + int(m.group(1)))
-
-        m = re.search(r"steamcommunity\.com/id/([^/?#\"'\s]+)", text, re.IGNORECASE)
-        if m:
-            return await self._resolve_vanity(m.group(1))
+        # 优先级保持不变：profiles > addfriend > id，遇到 profiles 立即返回
+        acc = ""
+        vanity = ""
+        for m in self._steamid_text_re.finditer(text):
+            sid = m.group("sid")
+            if sid:
+                return sid
+            if not acc and m.group("acc"):
+                acc = m.group("acc")
+            elif not vanity and m.group("vanity"):
+                vanity = m.group("vanity")
+        if acc:
+            return str(STEAM_ID64_BASE + int(acc))
+        if vanity:
+            return await self._resolve_vanity(vanity)
         return None
 
     async def _resolve_vanity(self, vanity: str) -> str | None:
+        return await single_flight(
+            self._inflight,
+            ("vanity", (vanity or "").lower()),
+            self._resolve_vanity_once,
+            vanity,
+        )
+
+    async def _resolve_vanity_once(self, vanity: str) -> str | None:
         http = self._http()
         if not vanity or not self.steam_web_api_key or not http:
             return None
+        cache_key = vanity.lower()
+        cached = self._vanity_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
             api = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/"
             params = {
@@ -165,11 +231,12 @@ class SteamApi:
             async with http.get(api, params=params, proxy=self._proxy()) as resp:
                 if resp.status != 200:
                     return None
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
             obj = (data or {}).get("response") or {}
             if int(obj.get("success") or 0) == 1:
                 sid = str(obj.get("steamid") or "").strip()
                 if sid:
+                    self._vanity_cache.set(cache_key, sid)
                     return sid
             return None
         except Exception as exc:
@@ -184,30 +251,39 @@ class SteamApi:
         http = self._http()
         if not steamids or not self.steam_web_api_key or not http:
             return {}
-        uniq = sorted({s for s in steamids if s})
+        uniq = [s for s in dict.fromkeys(steamids) if s]
+        batches = [uniq[i : i + 100] for i in range(0, len(uniq), 100)]
+        results = await asyncio.gather(
+            *(self._fetch_player_summaries_batch(http, batch) for batch in batches)
+        )
         out: dict[str, dict] = {}
-        for i in range(0, len(uniq), 100):
-            batch = uniq[i : i + 100]
-            try:
-                api = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
-                params = {
-                    "key": self.steam_web_api_key,
-                    "steamids": ",".join(batch),
-                }
-                async with http.get(api, params=params, proxy=self._proxy()) as resp:
-                    if resp.status != 200:
-                        continue
-                    data = await resp.json(content_type=None)
-                players = ((data or {}).get("response") or {}).get("players") or []
-                for p in players:
-                    sid = str((p or {}).get("steamid") or "").strip()
-                    if sid:
-                        out[sid] = p
-            except Exception as exc:
-                logger.warning(
-                    f"fetch player summaries failed for batch(size={len(batch)}): {exc!s}"
-                )
-                continue
+        for part in results:
+            out.update(part)
+        return out
+
+    async def _fetch_player_summaries_batch(
+        self, http: aiohttp.ClientSession, batch: list[str]
+    ) -> dict[str, dict]:
+        out: dict[str, dict] = {}
+        try:
+            api = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v2/"
+            params = {
+                "key": self.steam_web_api_key,
+                "steamids": ",".join(batch),
+            }
+            async with http.get(api, params=params, proxy=self._proxy()) as resp:
+                if resp.status != 200:
+                    return out
+                data = await self._read_json(resp)
+            players = ((data or {}).get("response") or {}).get("players") or []
+            for p in players:
+                sid = str((p or {}).get("steamid") or "").strip()
+                if sid:
+                    out[sid] = p
+        except Exception as exc:
+            logger.warning(
+                f"fetch player summaries failed for batch(size={len(batch)}): {exc!s}"
+            )
         return out
 
     @staticmethod
@@ -217,22 +293,25 @@ class SteamApi:
         appid = int(gameid_raw) if gameid_raw.isdigit() else 0
         if game_name or appid:
             return "in_game", appid, game_name or f"App {appid}"
-        personastate = int(player.get("personastate") or 0)
-        if personastate == 0:
-            return "offline", 0, ""
-        return "online", 0, ""
+        # personastate 非 0（忙碌/离开/打盹/想交易/想玩）一律视为在线
+        if int(player.get("personastate") or 0):
+            return _STATE_ONLINE
+        return _STATE_OFFLINE
 
     @staticmethod
     def state_text(state: str) -> str:
-        if state == "in_game":
-            return "游戏中"
-        if state == "online":
-            return "在线"
-        if state == "offline":
-            return "离线"
-        return state or "未知"
+        return _STATE_TEXTS.get(state) or state or "未知"
 
     async def fetch_playtime_text(self, steamid64: str, appid: int) -> str:
+        return await single_flight(
+            self._inflight,
+            ("playtime", (steamid64, appid)),
+            self._fetch_playtime_text_once,
+            steamid64,
+            appid,
+        )
+
+    async def _fetch_playtime_text_once(self, steamid64: str, appid: int) -> str:
         http = self._http()
         if not steamid64 or appid <= 0 or not self.steam_web_api_key or not http:
             return "未知"
@@ -243,15 +322,17 @@ class SteamApi:
                 "steamid": steamid64,
                 "include_appinfo": 0,
                 "include_played_free_games": 1,
+                # 只取目标游戏，避免拉回整个游戏库（可能上千条）
+                "appids_filter[0]": appid,
             }
             async with http.get(api, params=params, proxy=self._proxy()) as resp:
                 if resp.status != 200:
                     return "未知"
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
             games = ((data or {}).get("response") or {}).get("games") or []
             for g in games:
-                if int((g or {}).get("appid") or 0) == int(appid):
-                    mins = int((g or {}).get("playtime_forever") or 0)
+                if (g or {}).get("appid") == appid:
+                    mins = int(g.get("playtime_forever") or 0)
                     total_seconds = mins * 60
                     hours, rem = divmod(total_seconds, 3600)
                     minutes, seconds = divmod(rem, 60)
@@ -269,7 +350,8 @@ class SteamApi:
         if not text:
             return None
 
-        m = re.search(r"store\.steampowered\.com/app/(\d+)", text, re.IGNORECASE)
+        # 游戏名搜索是最常见的输入，不含 /app/ 时不进正则
+        m = self._store_app_re.search(text) if "/app/" in text.lower() else None
         if m:
             appid = int(m.group(1))
             name = await self.fetch_app_name(appid)
@@ -279,7 +361,7 @@ class SteamApi:
                 "url": f"https://store.steampowered.com/app/{appid}/",
             }
 
-        if re.fullmatch(r"\d+", text):
+        if text.isdecimal():
             appid = int(text)
             name = await self.fetch_app_name(appid)
             return {
@@ -300,7 +382,7 @@ class SteamApi:
             async with http.get(api, params=params, proxy=self._proxy()) as resp:
                 if resp.status != 200:
                     return None
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
             items = (data or {}).get("items") or []
             if not items:
                 return None
@@ -319,9 +401,17 @@ class SteamApi:
             return None
 
     async def fetch_app_name(self, appid: int) -> str:
+        return await single_flight(
+            self._inflight, ("app_name", appid), self._fetch_app_name_once, appid
+        )
+
+    async def _fetch_app_name_once(self, appid: int) -> str:
         http = self._http()
         if appid <= 0 or not http:
             return ""
+        cached = self._app_name_cache.get(appid)
+        if cached is not None:
+            return cached
         try:
             api = "https://store.steampowered.com/api/appdetails"
             params = {
@@ -332,12 +422,15 @@ class SteamApi:
             async with http.get(api, params=params, proxy=self._proxy()) as resp:
                 if resp.status != 200:
                     return ""
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
             obj = (data or {}).get(str(appid)) or {}
             if not obj.get("success"):
                 return ""
             inner = obj.get("data") or {}
-            return str(inner.get("name") or "")
+            name = str(inner.get("name") or "")
+            if name:
+                self._app_name_cache.set(appid, name)
+            return name
         except Exception as exc:
             logger.warning(f"fetch app name failed (appid={appid}): {exc!s}")
             return ""
@@ -356,7 +449,7 @@ class SteamApi:
             async with http.get(api, params=params, proxy=self._proxy()) as resp:
                 if resp.status != 200:
                     return None
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
 
             obj = (data or {}).get(str(appid)) or {}
             if not obj.get("success"):
@@ -437,7 +530,7 @@ class SteamApi:
                         f"itad lookup failed: status={resp.status}, body={body[:200]}"
                     )
                     return None
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
             if not isinstance(data, dict):
                 return None
             if not bool(data.get("found")):
@@ -470,7 +563,7 @@ class SteamApi:
                         f"itad search failed: status={resp.status}, body={body[:200]}"
                     )
                     return []
-                data = await resp.json(content_type=None)
+                data = await self._read_json(resp)
             if not isinstance(data, list):
                 return []
             return [dict(x) for x in data if isinstance(x, dict)]
@@ -513,7 +606,7 @@ class SteamApi:
                         f"itad history failed: status={resp.status}, body={body[:300]}"
                     )
                     return None
-                rows = await resp.json(content_type=None)
+                rows = await self._read_json(resp)
 
             if not isinstance(rows, list):
                 return None
@@ -586,6 +679,11 @@ class SteamApi:
         return str(latest.get("gid") or "")
 
     async def fetch_latest_news(self, appid: int) -> dict | None:
+        return await single_flight(
+            self._inflight, ("latest_news", appid), self._fetch_latest_news_once, appid
+        )
+
+    async def _fetch_latest_news_once(self, appid: int) -> dict | None:
         http = self._http()
         if appid <= 0 or not http:
             return None
@@ -597,19 +695,32 @@ class SteamApi:
                 "maxlength": 300,
                 "format": "json",
             }
-            async with http.get(api, params=params, proxy=self._proxy()) as resp:
+            cached = self._news_etags.get(appid)
+            headers = {"If-None-Match": cached[0]} if cached else None
+            async with http.get(
+                api, params=params, headers=headers, proxy=self._proxy()
+            ) as resp:
+                if resp.status == 304 and cached:
+                    return cached[1]
                 if resp.status != 200:
                     return None
-                data = await resp.json(content_type=None)
+                etag = resp.headers.get("ETag", "")
+                data = await self._read_json(resp)
             newsitems = ((data or {}).get("appnews") or {}).get("newsitems") or []
-            if not newsitems:
-                return None
-            return newsitems[0]
+            latest = newsitems[0] if newsitems else None
+            if etag:
+                self._news_etags.set(appid, (etag, latest))
+            return latest
         except Exception as exc:
             logger.warning(f"fetch latest news failed (appid={appid}): {exc!s}")
             return None
 
     async def fetch_cover_image(self, appid: int):
+        return await single_flight(
+            self._inflight, ("cover", appid), self._fetch_cover_image_once, appid
+        )
+
+    async def _fetch_cover_image_once(self, appid: int):
         if appid <= 0:
             return None
         urls: list[str] = []
@@ -621,7 +732,7 @@ class SteamApi:
                 headers = {"Authorization": f"Bearer {self.steamgriddb_api_key}"}
                 async with http.get(api, headers=headers, proxy=self._proxy()) as resp:
                     if resp.status == 200:
-                        data = await resp.json(content_type=None)
+                        data = await self._read_json(resp)
                         arr = (data or {}).get("data") or []
                         if arr:
                             url = str((arr[0] or {}).get("url") or "").strip()
@@ -637,11 +748,7 @@ class SteamApi:
             ]
         )
 
-        for url in urls:
-            img = await self.fetch_image_pil(url)
-            if img is not None:
-                return img
-        return None
+        return await self._fetch_first_image(urls)
 
     async def fetch_grid_image_by_id(self, grid_id: int):
         if grid_id <= 0:
@@ -662,7 +769,7 @@ class SteamApi:
                 async with http.get(api, headers=headers, proxy=self._proxy()) as resp:
                     if resp.status != 200:
                         continue
-                    payload = await resp.json(content_type=None)
+                    payload = await self._read_json(resp)
 
                 data = (payload or {}).get("data")
                 candidate_urls: list[str] = []
@@ -687,10 +794,9 @@ class SteamApi:
                         if candidate_urls:
                             break
 
-                for url in candidate_urls:
-                    img = await self.fetch_image_pil(url)
-                    if img is not None:
-                        return img
+                img = await self._fetch_first_image(candidate_urls)
+                if img is not None:
+                    return img
             except Exception as exc:
                 logger.warning(
                     f"steamgriddb grid fetch failed (grid_id={grid_id}): {exc!s}"
@@ -698,6 +804,21 @@ class SteamApi:
 
         return None
 
+    async def _fetch_first_image(self, urls: list[str]):
+        # 候选图同时下载，但仍按优先顺序取第一张成功的，其余取消。
+        if not urls:
+            return None
+        tasks = [asyncio.ensure_future(self.fetch_image_pil(url)) for url in urls]
+        try:
+            for task in tasks:
+                img = await task
+                if img is not None:
+                    return img
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
     async def fetch_image_pil(self, url: str):
         http = self._http()
         if not url or not http or Image is None:
@@ -706,8 +827,16 @@ class SteamApi:
             async with http.get(url, proxy=self._proxy()) as resp:
                 if resp.status != 200:
                     return None
+                if (resp.content_length or 0) > self._max_image_bytes:
+                    logger.warning(
+                        f"skip oversized image ({resp.content_length} bytes): {url}"
+                    )
+                    return None
                 data = await resp.read()
-            return await asyncio.to_thread(self._decode_image_sync, data)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._decode_pool, self._decode_image_sync, data
+            )
         except Exception as exc:
             logger.warning(f"fetch image failed: {exc!s}")
             return None
@@ -717,6 +846,11 @@ class SteamApi:
         if Image is None:
             return None
         try:
-            return Image.open(io.BytesIO(data)).convert("RGB")
+            img = Image.open(io.BytesIO(data))
+            img.draft("RGB", SteamApi._max_image_size)
+            img = img.convert("RGB")
+            # 缩小到卡片尺寸时 BILINEAR 与默认 BICUBIC 肉眼无差别，但更快。
+            img.thumbnail(SteamApi._max_image_size, Image.BILINEAR)
+            return img
         except Exception:
             return None
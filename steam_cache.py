@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+async def single_flight(
+    tasks: dict[Hashable, asyncio.Future],
+    key: Hashable,
+    fetch,
+    *args,
+    keep: bool = False,
+) -> Any:
+    # 相同 key 的请求同时进行时共用一次调用；keep=True 时结果在 tasks 存活期间一直复用。
+    task = tasks.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch(*args))
+        tasks[key] = task
+        if not keep:
+            task.add_done_callback(lambda _t: tasks.pop(key, None))
+    return await asyncio.shield(task)
+
+
+class TtlLruCache:
+    """容量有限、带过期时间的 LRU 缓存，用于跨轮询复用下载结果。"""
+
+    def __init__(self, maxsize: int, ttl_sec: float):
+        self._maxsize = max(1, int(maxsize))
+        self._ttl_sec = float(ttl_sec)
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl_sec, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats_text(self) -> str:
+        return (
+            f"{len(self._data)}/{self._maxsize} (hit={self.hits}, miss={self.misses})"
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import html
 import io
@@ -44,10 +45,16 @@ def _image_to_data_uri(image_obj, *, filename: str = "image.png") -> str | None:
 
     try:
         buf = io.BytesIO()
-        image_obj.save(buf, format="PNG")
+        if getattr(image_obj, "mode", None) == "RGB":
+            # 封面/头像是不透明照片，JPEG 体积远小于 PNG 且编码更快。
+            image_obj.save(buf, format="JPEG", quality=88)
+            mime = "image/jpeg"
+        else:
+            # 仅作为模板内嵌图片的中间产物，用最低压缩级别换取更快的编码。
+            image_obj.save(buf, format="PNG", compress_level=1)
+            mime, _ = mimetypes.guess_type(filename)
+            mime = mime or "image/png"
         payload = base64.b64encode(buf.getvalue()).decode("ascii")
-        mime, _ = mimetypes.guess_type(filename)
-        mime = mime or "image/png"
         return f"data:{mime};base64,{payload}"
     except Exception:
         return None
@@ -401,7 +408,8 @@ class SteamRenderer:
     async def render_batch_status_card(self, entries: list[dict]) -> str | None:
         if not entries or not self._html_render_func:
             return None
-        html_text = _build_batch_status_html(entries)
+        # 图片转 PNG/base64 与模板渲染都是 CPU 活，放到线程里避免阻塞事件循环。
+        html_text = await asyncio.to_thread(_build_batch_status_html, entries)
         # 裁剪到卡片主体区域，避免远程渲染默认画布过大导致上下左右留白。
         clip_height = max(400, 200 + len(entries) * 200)
         options = {
@@ -435,7 +443,8 @@ class SteamRenderer:
     ) -> str | None:
         if not self._html_render_func:
             return None
-        html_text = _build_news_html(
+        html_text = await asyncio.to_thread(
+            _build_news_html,
             appid=appid,
             game_name=game_name,
             title=title,
@@ -467,7 +476,8 @@ class SteamRenderer:
     ) -> str | None:
         if not self._html_render_func:
             return None
-        html_text = _build_itad_price_history_html(
+        html_text = await asyncio.to_thread(
+            _build_itad_price_history_html,
             game_name=game_name,
             appid=appid,
             game_id=game_id,
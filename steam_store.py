@@ -2,13 +2,20 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
 
 class SteamStateStore:
     def __init__(self, base_dir: Path, cards_dir: Path | None = None):
         self._base_dir = base_dir
         self._cards_dir = cards_dir
+        self._last_written: bytes | None = None
 
     def ensure_data_dir(self) -> None:
         self.base_dir().mkdir(parents=True, exist_ok=True)
@@ -44,7 +51,8 @@ class SteamStateStore:
         if not fp.exists():
             return {"bindings": [], "game_subscriptions": []}
         try:
-            data = json.loads(fp.read_text(encoding="utf-8"))
+            raw = fp.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             if isinstance(data, dict):
                 return data
             return {"bindings": [], "game_subscriptions": []}
@@ -55,11 +63,33 @@ class SteamStateStore:
         self, bindings: list[dict], game_subscriptions: list[dict]
     ) -> None:
         fp = self.state_file()
-        fp.parent.mkdir(parents=True, exist_ok=True)
         payload = {
             "bindings": bindings,
             "game_subscriptions": game_subscriptions,
         }
-        fp.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+        if orjson is not None:
+            data = orjson.dumps(payload)
+        else:
+            data = json.dumps(
+                payload, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+        # 大多数轮询不会改变状态，内容与上次写入一致时直接跳过落盘。
+        if data == self._last_written:
+            return
+        try:
+            self._write_bytes_atomic(fp, data)
+        except FileNotFoundError:
+            # 目录在启动时已由 ensure_data_dir 创建，仅在运行中被删掉时才补建。
+            fp.parent.mkdir(parents=True, exist_ok=True)
+            self._write_bytes_atomic(fp, data)
+        self._last_written = data
+
+    @staticmethod
+    def _write_bytes_atomic(fp: Path, data: bytes) -> None:
+        # 先写临时文件再替换，避免中途崩溃留下半截 state.json。
+        tmp = fp.with_name(f"{fp.name}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, fp)